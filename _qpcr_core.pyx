@@ -0,0 +1,36 @@
+# cython: language_level=3
+"""Compiled sample back-calculation kernel for qpcr_calculator (optional; built with setup.py)."""
+import numpy as np
+cimport cython
+from libc.math cimport isnan, pow, NAN
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def back_calc(const double[:, ::1] cq_mat, const double[::1] dil, double inv_slope, double b):
+    """Return (average Cq, undiluted amount) per row; empty Cq cells are NaN and rows with none give NaN."""
+    cdef Py_ssize_t n_rows = cq_mat.shape[0]
+    cdef Py_ssize_t n_cols = cq_mat.shape[1]
+    avg_arr = np.empty(n_rows)
+    undiluted_arr = np.empty(n_rows)
+    cdef double[::1] avg_cqs = avg_arr
+    cdef double[::1] undiluted = undiluted_arr
+    cdef Py_ssize_t i, j
+    cdef double total, cq, avg
+    cdef int count
+    with nogil:
+        for i in range(n_rows):
+            total = 0.0
+            count = 0
+            for j in range(n_cols):
+                cq = cq_mat[i, j]
+                if not isnan(cq):
+                    total += cq
+                    count += 1
+            if count == 0:
+                avg_cqs[i] = NAN
+                undiluted[i] = NAN
+            else:
+                avg = total / count
+                avg_cqs[i] = avg
+                undiluted[i] = pow(10.0, avg * inv_slope + b) * dil[i]
+    return avg_arr, undiluted_arr
@@ -0,0 +1,53 @@
+"""Numba-compiled kernels for qpcr_calculator; imported on first use so numba stays off the startup path."""
+import math
+import numpy as np
+from numba import njit
+
+# Must match qpcr_calculator._SPREAD_RTOL; numba freezes it as a compile-time constant.
+_SPREAD_RTOL = 1e-12
+
+# No 'nnan'/'ninf' fast-math flags: the kernel relies on NaN checks for empty Cq cells.
+@njit(cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'})
+def back_calc(cq_mat, dil, inv_slope, b):
+    """Return (average Cq, undiluted amount) per row; empty Cq cells are NaN and rows with none give NaN."""
+    n_rows = cq_mat.shape[0]
+    avg_cqs = np.empty(n_rows)
+    undiluted = np.empty(n_rows)
+    for i in range(n_rows):
+        total = 0.0
+        count = 0
+        for j in range(cq_mat.shape[1]):
+            cq = cq_mat[i, j]
+            if not np.isnan(cq):
+                total += cq
+                count += 1
+        if count == 0:
+            avg_cqs[i] = np.nan
+            undiluted[i] = np.nan
+        else:
+            avg = total / count
+            avg_cqs[i] = avg
+            undiluted[i] = 10.0 ** (avg * inv_slope + b) * dil[i]
+    return avg_cqs, undiluted
+
+@njit(cache=True)
+def fit_line(x, y):
+    """Least-squares fit y = slope * x + intercept; returns (slope, intercept, r), or NaNs if all x are equal."""
+    n = x.size
+    sx = sy = sxx = sxy = syy = 0.0
+    for i in range(n):
+        sx += x[i]
+        sy += y[i]
+        sxx += x[i] * x[i]
+        sxy += x[i] * y[i]
+        syy += y[i] * y[i]
+    sxx_c = n * sxx - sx * sx
+    sxy_c = n * sxy - sx * sy
+    syy_c = n * syy - sy * sy
+    # Same zero-spread tolerance as qpcr_calculator._fit_line_numpy.
+    if sxx_c <= _SPREAD_RTOL * n * sxx:
+        return np.nan, np.nan, np.nan
+    slope = sxy_c / sxx_c
+    intercept = (sy - slope * sx) / n
+    r = sxy_c / math.sqrt(sxx_c * syy_c) if syy_c > _SPREAD_RTOL * n * syy else 0.0
+    return slope, intercept, r
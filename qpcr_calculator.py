@@ -1,10 +1,71 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from scipy.stats import linregress
 import math
+import functools
+
+# 10**x == 2**(x * log2(10)); np.exp2 takes the fast libm/SIMD path that np.power(10, x) does not.
+# Only use NumPy ufuncs on whole arrays: for single floats use math.pow/math.log10, since a ufunc
+# call on a scalar pays NumPy's dispatch overhead for no gain.
+_LOG2_10 = math.log2(10)
+
+# Relative tolerance below which a centered sum of squares (n*sxx - sx*sx) counts as zero.
+_SPREAD_RTOL = 1e-12
+
+def _fit_line_numpy(x, y):
+    """Least-squares fit y = slope * x + intercept; returns (slope, intercept, r), or NaNs if all x are equal."""
+    # Closed-form least squares from the sufficient statistics (n, sx, sy, sxx, sxy, syy).
+    n = x.size
+    sx = x.sum()
+    sy = y.sum()
+    sxx = (x * x).sum()
+    syy = (y * y).sum()
+    sxx_c = n * sxx - sx * sx
+    sxy_c = n * (x * y).sum() - sx * sy
+    syy_c = n * syy - sy * sy
+    # The centered sums are differences of large terms and only round to ~1e-16 * n * s**, not to 0,
+    # when all values are equal; treat anything within that tolerance as zero spread.
+    if sxx_c <= _SPREAD_RTOL * n * sxx:
+        return math.nan, math.nan, math.nan
+    slope = sxy_c / sxx_c
+    intercept = (sy - slope * sx) / n
+    r = sxy_c / math.sqrt(sxx_c * syy_c) if syy_c > _SPREAD_RTOL * n * syy else 0.0
+    return float(slope), float(intercept), float(r)
+
+def _back_calc_numpy(cq_mat, dil, inv_slope, b):
+    """Return (average Cq, undiluted amount) per row; empty Cq cells are NaN and rows with none give NaN."""
+    counts = np.count_nonzero(~np.isnan(cq_mat), axis=1)
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        avg_cqs = np.nansum(cq_mat, axis=1) / counts
+        # Use standard curve: Cq = slope * log10(amount) + intercept  => log10(amount) = Cq / slope - intercept / slope.
+        undiluted = np.exp2((avg_cqs * inv_slope + b) * _LOG2_10) * dil
+    return avg_cqs, undiluted
+
+@functools.lru_cache(maxsize=None)
+def _get_back_calc():
+    """Return the fastest available back-calculation kernel: compiled extension, then Numba, then NumPy."""
+    try:
+        # Built with `python setup.py build_ext --inplace`.
+        from _qpcr_core import back_calc
+        return back_calc
+    except ImportError:
+        pass
+    try:
+        from _qpcr_numba import back_calc
+        return back_calc
+    except ImportError:
+        return _back_calc_numpy
+
+@functools.lru_cache(maxsize=None)
+def _get_fit_line():
+    """Return the Numba standard-curve fit if numba is installed, else the NumPy one."""
+    try:
+        from _qpcr_numba import fit_line
+        return fit_line
+    except ImportError:
+        return _fit_line_numpy
 
 class QpcrApp:
     def __init__(self, master):
@@ -13,6 +74,14 @@ class QpcrApp:
         self.slope = None       # Standard curve slope
         self.intercept = None   # Standard curve intercept
         self.r_value = None     # Regression r_value
+        # Back-calculation coefficients: log10(amount) = Cq * _inv_slope + _b.
+        # Always refreshed together with slope/intercept in plot_std_curve.
+        self._inv_slope = None
+        self._b = None
+        # Replot caches, keyed on the raw array bytes: (amounts key, log_amounts) and
+        # (amounts + cqs key, slope, intercept, r_value).
+        self._log_cache = None
+        self._fit_cache = None
         
         # Create notebook (tabs)
         self.notebook = ttk.Notebook(master)
@@ -52,11 +121,21 @@ class QpcrApp:
         ttk.Button(std_button_frame, text="Plot Standard Curve", command=self.plot_std_curve).pack(side=tk.LEFT, padx=5)
         
         # Matplotlib figure for the standard curve
-        self.std_fig, self.std_ax = plt.subplots(figsize=(6, 4))
+        self.std_fig = Figure(figsize=(6, 4))
+        self.std_ax = self.std_fig.add_subplot()
         self.std_ax.set_xlabel("log10(Amount)")
         self.std_ax.set_ylabel("Cq")
         self.std_ax.set_title("qPCR Standard Curve")
         self.std_ax.grid(True)
+        # Artists are created once and updated in place by plot_std_curve.
+        self._std_scatter = self.std_ax.scatter([], [], color='blue', label="Data points")
+        self._std_line, = self.std_ax.plot([], [], color='red', label="Fitted line")
+        self._std_text = self.std_ax.text(0.05, 0.95, "", transform=self.std_ax.transAxes,
+                                          fontsize=10, verticalalignment='top',
+                                          bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5))
+        # The empty placeholder artists would otherwise shrink the startup view around (0, 0).
+        self.std_ax.set_xlim(0, 1)
+        self.std_ax.set_ylim(0, 1)
         self.std_canvas = FigureCanvasTkAgg(self.std_fig, master=self.standards_frame)
         self.std_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
     
@@ -69,63 +148,85 @@ class QpcrApp:
         self.std_rows.append((amount_entry, cq_entry))
     
     def get_std_data(self):
-        amounts = []
-        cqs = []
+        # Write parsed values straight into preallocated arrays; k counts the filled rows.
+        amounts = np.empty(len(self.std_rows))
+        cqs = np.empty_like(amounts)
+        k = 0
         for i, (amount_entry, cq_entry) in enumerate(self.std_rows, start=1):
             amt_str = amount_entry.get().strip()
             cq_str = cq_entry.get().strip()
             if amt_str and cq_str:
                 try:
-                    amt = float(amt_str)
-                    cq = float(cq_str)
-                    amounts.append(amt)
-                    cqs.append(cq)
+                    amounts[k] = float(amt_str)
+                    cqs[k] = float(cq_str)
                 except ValueError:
                     messagebox.showerror("Invalid Input", f"Standard row {i} contains non-numeric data.")
                     return None, None
-        if len(amounts) < 2:
+                if not amounts[k] > 0:
+                    messagebox.showerror("Invalid Input", f"Standard row {i} must have an amount greater than zero.")
+                    return None, None
+                k += 1
+        if k < 2:
             messagebox.showerror("Insufficient Data", "Please enter at least two standard data points.")
             return None, None
-        return np.array(amounts), np.array(cqs)
+        return amounts[:k], cqs[:k]
     
     def plot_std_curve(self):
         amounts, cqs = self.get_std_data()
         if amounts is None or cqs is None:
             return
         
-        log_amounts = np.log10(amounts)
-        regression = linregress(log_amounts, cqs)
-        self.slope = regression.slope
-        self.intercept = regression.intercept
-        self.r_value = regression.rvalue
+        # Editing only Cq values reuses the log10 amounts; unchanged standards also reuse the fit.
+        amounts_key = amounts.tobytes()
+        if self._log_cache is not None and self._log_cache[0] == amounts_key:
+            log_amounts = self._log_cache[1]
+        else:
+            log_amounts = np.log10(amounts)
+            self._log_cache = (amounts_key, log_amounts)
+        fit_key = amounts_key + cqs.tobytes()
+        if self._fit_cache is not None and self._fit_cache[0] == fit_key:
+            _, slope, intercept, r_value = self._fit_cache
+        else:
+            slope, intercept, r_value = _get_fit_line()(log_amounts, cqs)
+            if math.isnan(slope):
+                messagebox.showerror("Invalid Input", "Standard amounts must not all be identical.")
+                return
+            self._fit_cache = (fit_key, slope, intercept, r_value)
+        self.slope = float(slope)
+        self.intercept = float(intercept)
+        self.r_value = float(r_value)
+        if self.slope != 0:
+            self._inv_slope = 1.0 / self.slope
+            self._b = -self.intercept / self.slope
+        else:
+            self._inv_slope = self._b = float('nan')
         
+        # Scalar path: math.pow, not np.power (see _LOG2_10). A zero slope leaves _inv_slope NaN.
         try:
-            efficiency = (10 ** (-1 / self.slope) - 1) * 100
-        except ZeroDivisionError:
-            efficiency = float('nan')
+            efficiency = (math.pow(10.0, -self._inv_slope) - 1) * 100
+        except OverflowError:
+            efficiency = float('inf')
         
-        self.std_ax.clear()
-        self.std_ax.grid(True)
-        self.std_ax.set_xlabel("log10(Amount)")
-        self.std_ax.set_ylabel("Cq")
-        self.std_ax.set_title("qPCR Standard Curve")
-        
-        self.std_ax.scatter(log_amounts, cqs, color='blue', label="Data points")
-        x_vals = np.linspace(min(log_amounts)-0.1, max(log_amounts)+0.1, 100)
+        self._std_scatter.set_offsets(np.column_stack((log_amounts, cqs)))
+        # A straight line only needs its two endpoints.
+        x_vals = np.array([log_amounts.min()-0.1, log_amounts.max()+0.1])
         y_vals = self.slope * x_vals + self.intercept
-        self.std_ax.plot(x_vals, y_vals, color='red', label="Fitted line")
+        self._std_line.set_data(x_vals, y_vals)
         
         eq_text = f"Cq = {self.slope:.3f} * log10(Amount) + {self.intercept:.3f}"
         r2_text = f"R² = {self.r_value**2:.4f}"
         eff_text = f"PCR Efficiency = {efficiency:.2f}%"
         full_text = eq_text + "\n" + r2_text + "\n" + eff_text
-        self.std_ax.text(0.05, 0.95, full_text, transform=self.std_ax.transAxes,
-                         fontsize=10, verticalalignment='top',
-                         bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5))
-        
-        self.std_ax.legend()
+        self._std_text.set_text(full_text)
+        
+        # Limits follow directly from the data, so set them and skip matplotlib's autoscaling.
+        self.std_ax.set_xlim(x_vals[0], x_vals[1])
+        self.std_ax.set_ylim(min(cqs.min(), y_vals.min()) - 1, max(cqs.max(), y_vals.max()) + 1)
+        self.std_ax.set_autoscale_on(False)
+        if self.std_ax.get_legend() is None:
+            self.std_ax.legend()
         self.std_fig.tight_layout()
-        self.std_canvas.draw()
+        self.std_canvas.draw_idle()
     
     ########################
     # Samples Tab Methods  #
@@ -156,7 +257,9 @@ class QpcrApp:
         # This container will hold all sample sections.
         self.samples_container = ttk.Frame(self.samples_canvas)
         self.samples_canvas.create_window((0, 0), window=self.samples_container, anchor="nw")
-        self.samples_container.bind("<Configure>", lambda event: self.samples_canvas.configure(scrollregion=self.samples_canvas.bbox("all")))
+        # Coalesce bursts of <Configure> events (one per added widget) into a single scrollregion update.
+        self._scrollregion_pending = None
+        self.samples_container.bind("<Configure>", lambda event: self._schedule_scrollregion())
         
         # Global buttons for samples (placed below the scrollable area)
         sample_button_frame = ttk.Frame(self.samples_frame)
@@ -170,7 +273,7 @@ class QpcrApp:
         self.results_frame.pack(fill=tk.BOTH, expand=False, padx=10, pady=5)
         
         # Text box for sample average results (table output).
-        self.sample_avg_text = tk.Text(self.results_frame, height=6)
+        self.sample_avg_text = tk.Text(self.results_frame, height=6, undo=False)
         self.sample_avg_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Frame for the histogram plot and log scale toggle.
@@ -182,13 +285,29 @@ class QpcrApp:
         log_toggle = ttk.Checkbutton(self.hist_frame, text="Logarithmic Y-Axis", variable=self.log_scale_var, command=self.update_histogram)
         log_toggle.pack(anchor=tk.W)
         
-        # Create a matplotlib figure for the histogram.
-        self.hist_fig, self.hist_ax = plt.subplots(figsize=(6, 4))
-        self.hist_canvas = FigureCanvasTkAgg(self.hist_fig, master=self.hist_frame)
-        self.hist_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # The histogram figure is built on first use by _create_hist_canvas.
+        self.hist_fig = None
         
         # List to hold sample sections.
         self.samples = []
+        # Flat view of every dilution row across samples, in creation order:
+        # (dilution_entry, cq1_entry, cq2_entry, cq3_entry, avg_cq_label, undiluted_label).
+        self._flat_rows = []
+        # Sample index of each entry in _flat_rows, for per-sample grouping.
+        self._row_to_sample = []
+        # Results of the last calculate_samples run, aligned with each other:
+        # undiluted amount per row (NaN when unavailable) and that row's sample index.
+        self._undil_values = np.empty(0)
+        self._sample_idx = np.empty(0, dtype=np.intp)
+    
+    def _schedule_scrollregion(self):
+        """Queue a scrollregion update for when Tk is idle, unless one is already queued."""
+        if self._scrollregion_pending is None:
+            self._scrollregion_pending = self.master.after_idle(self._apply_scrollregion)
+    
+    def _apply_scrollregion(self):
+        self._scrollregion_pending = None
+        self.samples_canvas.configure(scrollregion=self.samples_canvas.bbox("all"))
     
     def add_sample(self):
         """Adds a new sample section with its own sample name entry and an initial dilution row."""
@@ -207,7 +326,7 @@ class QpcrApp:
         for col, header in enumerate(headers):
             ttk.Label(dilution_frame, text=header, borderwidth=1, relief="solid", width=15).grid(row=0, column=col, padx=1, pady=1)
         
-        sample_dict = {"name_entry": name_entry, "dilution_rows": [], "frame": dilution_frame}
+        sample_dict = {"name_entry": name_entry, "dilution_rows": [], "frame": dilution_frame, "index": len(self.samples)}
         self.samples.append(sample_dict)
         
         # Button to add dilution row for this sample.
@@ -243,6 +362,8 @@ class QpcrApp:
             "undiluted_label": undiluted_label
         }
         sample_dict["dilution_rows"].append(dilution_row)
+        self._flat_rows.append((dilution_entry, cq1_entry, cq2_entry, cq3_entry, avg_cq_label, undiluted_label))
+        self._row_to_sample.append(sample_dict["index"])
     
     def calculate_samples(self):
         # Ensure that a standard curve has been calculated.
@@ -250,46 +371,42 @@ class QpcrApp:
             messagebox.showerror("No Standard Curve", "Please calculate the standard curve in the Standards tab first.")
             return
         
-        for sample in self.samples:
-            for dilution_row in sample["dilution_rows"]:
-                dilution_str = dilution_row["dilution_entry"].get().strip()
-                if not dilution_str:
-                    messagebox.showerror("Missing Data", "Please enter a dilution factor for all dilution rows.")
-                    return
-                try:
-                    dilution_factor = float(dilution_str)
-                except ValueError:
-                    messagebox.showerror("Invalid Input", "Dilution factor must be numeric.")
-                    return
-                
-                # Get Cq values (ignore empty ones).
-                cqs = []
-                for key in ["cq1_entry", "cq2_entry", "cq3_entry"]:
-                    val = dilution_row[key].get().strip()
-                    if val:
-                        try:
-                            cqs.append(float(val))
-                        except ValueError:
-                            messagebox.showerror("Invalid Input", "Cq values must be numeric.")
-                            return
-                
-                if not cqs:
-                    dilution_row["avg_cq_label"].config(text="N/A")
-                    dilution_row["undiluted_label"].config(text="N/A")
-                    continue
-                
-                avg_cq = sum(cqs) / len(cqs)
-                dilution_row["avg_cq_label"].config(text=f"{avg_cq:.3f}")
-                
-                # Use standard curve: Cq = slope * log10(amount) + intercept  => log10(amount) = (Cq - intercept) / self.slope.
-                try:
-                    log_amount = (avg_cq - self.intercept) / self.slope
-                    amount_diluted = 10 ** log_amount
-                except Exception:
-                    amount_diluted = float('nan')
-                
-                undiluted_amount = amount_diluted * dilution_factor
-                dilution_row["undiluted_label"].config(text=f"{undiluted_amount:.3e}")
+        # Single pass over the widgets: gather every dilution row's inputs into arrays.
+        n_rows = len(self._flat_rows)
+        cq_mat = np.full((n_rows, 3), np.nan)
+        dil = np.empty(n_rows)
+        for i, (dilution_entry, cq1_entry, cq2_entry, cq3_entry, _, _) in enumerate(self._flat_rows):
+            dilution_str = dilution_entry.get().strip()
+            if not dilution_str:
+                messagebox.showerror("Missing Data", "Please enter a dilution factor for all dilution rows.")
+                return
+            try:
+                dil[i] = float(dilution_str)
+            except ValueError:
+                messagebox.showerror("Invalid Input", "Dilution factor must be numeric.")
+                return
+            
+            # Get Cq values (empty ones stay NaN and are ignored in the average).
+            for j, cq_entry in enumerate((cq1_entry, cq2_entry, cq3_entry)):
+                val = cq_entry.get().strip()
+                if val:
+                    try:
+                        cq_mat[i, j] = float(val)
+                    except ValueError:
+                        messagebox.showerror("Invalid Input", "Cq values must be numeric.")
+                        return
+        
+        avg_cqs, undiluted = _get_back_calc()(cq_mat, dil, self._inv_slope, self._b)
+        self._undil_values = undiluted
+        self._sample_idx = np.array(self._row_to_sample, dtype=np.intp)
+        
+        for (_, _, _, _, avg_cq_label, undiluted_label), avg_cq, undiluted_amount in zip(self._flat_rows, avg_cqs.tolist(), undiluted.tolist()):
+            if math.isnan(avg_cq):
+                avg_cq_label.config(text="N/A")
+                undiluted_label.config(text="N/A")
+                continue
+            avg_cq_label.config(text=f"{avg_cq:.3f}")
+            undiluted_label.config(text=f"{undiluted_amount:.3e}")
     
     def show_sample_averages(self):
         """
@@ -301,65 +418,106 @@ class QpcrApp:
         # We'll build a list of lines in tab-delimited format.
         out_lines = ["Sample Name\tAverage Undiluted Amount\t# Dilutions"]
         
+        # Per-sample sums and counts of the valid undiluted amounts in one pass.
+        valid = ~np.isnan(self._undil_values)
+        sample_idx = self._sample_idx[valid]
+        sums = np.bincount(sample_idx, weights=self._undil_values[valid], minlength=len(self.samples))
+        counts = np.bincount(sample_idx, minlength=len(self.samples))
+        # Plain Python floats/ints format faster than NumPy scalars.
+        means = (sums / np.maximum(counts, 1)).tolist()
+        counts = counts.tolist()
+        
         for sample in self.samples:
+            i = sample["index"]
+            if not counts[i]:
+                continue
             sample_name = sample["name_entry"].get().strip()
             if not sample_name:
                 sample_name = "Unnamed Sample"
-            values = []
-            for dilution_row in sample["dilution_rows"]:
-                undiluted_text = dilution_row["undiluted_label"].cget("text")
-                try:
-                    undiluted_value = float(undiluted_text)
-                    values.append(undiluted_value)
-                except ValueError:
-                    continue
-            if values:
-                avg_val = sum(values) / len(values)
-                self.sample_avg_data[sample_name] = avg_val
-                # Append a tab-delimited line for this sample
-                out_lines.append(f"{sample_name}\t{avg_val:.3e}\t{len(values)}")
-        
-        # Clear the text widget, then insert the table
-        self.sample_avg_text.delete(1.0, tk.END)
+            avg_val = means[i]
+            self.sample_avg_data[sample_name] = avg_val
+            # Append a tab-delimited line for this sample
+            out_lines.append(f"{sample_name}\t{avg_val:.3e}\t{counts[i]}")
+        
+        # Replace the text widget contents with the table in a single operation
         if len(out_lines) == 1:
             # Means no valid sample lines were appended
-            self.sample_avg_text.insert(tk.END, "No sample results available.\n")
+            self.sample_avg_text.replace("1.0", tk.END, "No sample results available.\n")
         else:
-            self.sample_avg_text.insert(tk.END, "\n".join(out_lines))
+            self.sample_avg_text.replace("1.0", tk.END, "\n".join(out_lines))
         
         self.plot_histogram()
     
+    def _create_hist_canvas(self):
+        """Create the histogram figure and its persistent artists inside hist_frame."""
+        self.hist_fig = Figure(figsize=(6, 4))
+        self.hist_ax = self.hist_fig.add_subplot()
+        self.hist_canvas = FigureCanvasTkAgg(self.hist_fig, master=self.hist_frame)
+        self.hist_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Bars are kept between calls and updated in place when the sample count is unchanged.
+        self._hist_bars = None
+        self._hist_empty_text = self.hist_ax.text(0.5, 0.5, "No sample data to plot", horizontalalignment="center",
+                                                  transform=self.hist_ax.transAxes, visible=False)
+    
     def plot_histogram(self):
         """Plot a bar chart (histogram) of average undiluted amounts per sample."""
-        self.hist_ax.clear()
-        if not hasattr(self, "sample_avg_data") or not self.sample_avg_data:
-            self.hist_ax.text(0.5, 0.5, "No sample data to plot", horizontalalignment="center")
-            self.hist_canvas.draw()
+        if self.hist_fig is None:
+            self._create_hist_canvas()
+        has_data = hasattr(self, "sample_avg_data") and bool(self.sample_avg_data)
+        self._hist_empty_text.set_visible(not has_data)
+        if not has_data:
+            if self._hist_bars is not None:
+                self._hist_bars.remove()
+                self._hist_bars = None
+            # Reset the axes to their empty state so no stale limits or labels remain.
+            self.hist_ax.set_xticks([])
+            self.hist_ax.set_ylabel("")
+            self.hist_ax.set_title("")
+            self.hist_ax.set_yscale("linear")
+            # Drop the removed bars from dataLim, then reset the limits to the default and
+            # re-enable autoscaling for the next plot.
+            self.hist_ax.relim()
+            self.hist_ax.set_xlim(0, 1)
+            self.hist_ax.set_ylim(0, 1)
+            self.hist_ax.set_autoscale_on(True)
+            self.hist_canvas.draw_idle()
             return
         
         sample_names = list(self.sample_avg_data.keys())
         avg_amounts = [self.sample_avg_data[name] for name in sample_names]
         x_pos = np.arange(len(sample_names))
         
-        self.hist_ax.bar(x_pos, avg_amounts, align='center', alpha=0.7)
+        if self._hist_bars is not None and len(self._hist_bars) == len(avg_amounts):
+            for bar, height in zip(self._hist_bars, avg_amounts):
+                bar.set_height(height)
+        else:
+            if self._hist_bars is not None:
+                self._hist_bars.remove()
+            self._hist_bars = self.hist_ax.bar(x_pos, avg_amounts, align='center', alpha=0.7)
         self.hist_ax.set_xticks(x_pos)
         self.hist_ax.set_xticklabels(sample_names, rotation=45, ha='right')
         self.hist_ax.set_ylabel("Average Undiluted Amount")
         self.hist_ax.set_title("Sample Comparison")
+        self.hist_ax.relim()
         
         # Toggle y-axis scale based on the checkbutton.
         if self.log_scale_var.get():
             self.hist_ax.set_yscale("log")
         else:
             self.hist_ax.set_yscale("linear")
+        self.hist_ax.autoscale_view()
         
         # Prevent labels from being cut off
         self.hist_fig.tight_layout()
-        self.hist_canvas.draw()
+        self.hist_canvas.draw_idle()
     
     def update_histogram(self):
-        """Called when the log scale toggle changes."""
-        self.plot_histogram()
+        """Called when the log scale toggle changes; only the y-scale changes, so skip the full replot."""
+        # Nothing plotted yet, or the empty state, which stays on linear axes.
+        if self.hist_fig is None or self._hist_bars is None:
+            return
+        self.hist_ax.set_yscale("log" if self.log_scale_var.get() else "linear")
+        self.hist_canvas.draw_idle()
 
 if __name__ == '__main__':
     root = tk.Tk()
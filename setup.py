@@ -0,0 +1,11 @@
+"""Builds the optional compiled kernel: python setup.py build_ext --inplace"""
+from setuptools import setup, Extension
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    raise SystemExit("Building _qpcr_core requires Cython: pip install cython")
+
+setup(
+    name="qpcr-calculator",
+    ext_modules=cythonize([Extension("_qpcr_core", ["_qpcr_core.pyx"])]),
+)
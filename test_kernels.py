@@ -0,0 +1,92 @@
+"""Checks that the interchangeable back-calculation and fit kernels agree."""
+import math
+
+import numpy as np
+import pytest
+
+import qpcr_calculator as qc
+
+
+def _compiled_kernel(module_name):
+    module = pytest.importorskip(module_name)
+    return module.back_calc
+
+
+def _fit_kernels():
+    kernels = [qc._fit_line_numpy]
+    try:
+        from _qpcr_numba import fit_line
+        kernels.append(fit_line)
+    except ImportError:
+        pass
+    return kernels
+
+
+@pytest.fixture
+def cq_data():
+    rng = np.random.default_rng(0)
+    cq_mat = rng.uniform(15.0, 35.0, size=(200, 3))
+    # Knock out cells at random, including whole rows.
+    cq_mat[rng.random(cq_mat.shape) < 0.3] = np.nan
+    cq_mat[::17] = np.nan
+    dil = rng.choice([1.0, 10.0, 100.0, 1000.0], size=200)
+    return np.ascontiguousarray(cq_mat), dil
+
+
+@pytest.mark.parametrize("module_name", ["_qpcr_core", "_qpcr_numba"])
+@pytest.mark.parametrize("slope, intercept", [(-3.32, 38.0), (-3.6, 40.5)])
+def test_back_calc_matches_numpy(module_name, slope, intercept, cq_data):
+    back_calc = _compiled_kernel(module_name)
+    cq_mat, dil = cq_data
+    inv_slope, b = 1.0 / slope, -intercept / slope
+    expected_avg, expected_undiluted = qc._back_calc_numpy(cq_mat, dil, inv_slope, b)
+    avg, undiluted = back_calc(cq_mat, dil, inv_slope, b)
+    np.testing.assert_allclose(avg, expected_avg, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(undiluted, expected_undiluted, rtol=1e-9, equal_nan=True)
+    assert np.isnan(avg[::17]).all()
+
+
+@pytest.mark.parametrize("module_name", ["_qpcr_core", "_qpcr_numba"])
+def test_back_calc_nan_coefficients(module_name, cq_data):
+    # A zero slope leaves the cached coefficients NaN; averages are still reported.
+    back_calc = _compiled_kernel(module_name)
+    cq_mat, dil = cq_data
+    expected_avg, _ = qc._back_calc_numpy(cq_mat, dil, math.nan, math.nan)
+    avg, undiluted = back_calc(cq_mat, dil, math.nan, math.nan)
+    np.testing.assert_allclose(avg, expected_avg, equal_nan=True)
+    assert np.isnan(undiluted).all()
+
+
+def test_back_calc_numpy_known_values():
+    cq_mat = np.array([[20.0, 21.0, np.nan], [np.nan, np.nan, np.nan]])
+    avg, undiluted = qc._back_calc_numpy(cq_mat, np.array([10.0, 10.0]), -1 / 3.3, 30 / 3.3)
+    assert avg[0] == pytest.approx(20.5)
+    assert undiluted[0] == pytest.approx(10 ** ((20.5 - 30) / -3.3) * 10)
+    assert np.isnan(avg[1]) and np.isnan(undiluted[1])
+
+
+@pytest.mark.parametrize("fit_line", _fit_kernels())
+def test_fit_line_matches_polyfit(fit_line):
+    x = np.log10([1e5, 1e4, 1e3, 1e2, 1e1])
+    y = np.array([17.1, 20.4, 23.8, 27.2, 30.4])
+    slope, intercept, r = fit_line(x, y)
+    expected_slope, expected_intercept = np.polyfit(x, y, 1)
+    assert slope == pytest.approx(expected_slope)
+    assert intercept == pytest.approx(expected_intercept)
+    assert r == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+
+@pytest.mark.parametrize("fit_line", _fit_kernels())
+@pytest.mark.parametrize("value, n", [(2.2, 5), (1.1, 7), (0.0, 3), (math.log10(3e-7), 6)])
+def test_fit_line_identical_x(fit_line, value, n):
+    x = np.full(n, value)
+    slope, intercept, r = fit_line(x, np.arange(n, dtype=float))
+    assert math.isnan(slope) and math.isnan(intercept) and math.isnan(r)
+
+
+@pytest.mark.parametrize("fit_line", _fit_kernels())
+def test_fit_line_constant_y(fit_line):
+    slope, intercept, r = fit_line(np.arange(5, dtype=float), np.full(5, 22.2))
+    assert slope == pytest.approx(0.0)
+    assert intercept == pytest.approx(22.2)
+    assert r == 0.0